@@ -3,9 +3,8 @@ import os
 import os.path
 import pathlib
 import tempfile
-import threading
 import weakref
-from typing import Callable, Iterable, Mapping, Optional, Union
+from typing import Callable, Mapping, Optional, Sequence, Union
 
 import numpy as np
 
@@ -14,6 +13,15 @@ from distributed.utils import nbytes
 
 _new_cuda_buffer: Optional[Callable[[int], object]] = None
 
+# Maximum number of buffers that can be passed to a single `os.writev()` or
+# `os.readv()` call
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
 
 def get_new_cuda_buffer() -> Callable[[int], object]:
     """Return a function to create an empty CUDA buffer"""
@@ -113,8 +121,8 @@ class SpillToDiskProperties:
             Enable the use of GPUDirect Storage. If ``None``, the "gds-spilling"
             config value are used, which defaults to ``False``.
         """
-        self.lock = threading.Lock()
-        self.counter = 0
+        # Notice, `next()` on an `itertools.count` is atomic thus no lock is needed
+        self.counter = itertools.count(1)
         self.root_dir = pathlib.Path(root_dir)
         os.makedirs(self.root_dir, exist_ok=True)
         self.tmpdir = tempfile.TemporaryDirectory(dir=self.root_dir)
@@ -136,21 +144,79 @@ class SpillToDiskProperties:
 
     def gen_file_path(self) -> str:
         """Generate an unique file path"""
-        with self.lock:
-            self.counter += 1
-            return str(
-                pathlib.Path(self.tmpdir.name) / pathlib.Path("%04d" % self.counter)
-            )
+        return str(
+            pathlib.Path(self.tmpdir.name) / pathlib.Path("%04d" % next(self.counter))
+        )
+
+
+def writev_all(fd: int, frames: Sequence) -> None:
+    """Write all frames to a file descriptor using scatter-gather I/O
+
+    The frames are written without concatenating them first. We call
+    `os.writev()` repeatedly since it accepts at most `IOV_MAX` buffers
+    and might write fewer bytes than requested, e.g. Linux writes at
+    most ~2 GiB per call.
+
+    Parameters
+    ----------
+    fd: int
+        File descriptor to write to
+    frames: Sequence
+        The frames to write, must support the buffer protocol
+    """
+    bufs = list(frames)
+    i = 0
+    while i < len(bufs):
+        written = os.writev(fd, bufs[i : i + _IOV_MAX])
+        # Skip the fully written buffers and slice the partially written one
+        while i < len(bufs) and written >= nbytes(bufs[i]):
+            written -= nbytes(bufs[i])
+            i += 1
+        if written > 0:
+            bufs[i] = memoryview(bufs[i]).cast("B")[written:]
+
+
+def readv_all(fd: int, buffers: Sequence) -> None:
+    """Read into all buffers from a file descriptor using scatter-gather I/O
 
+    Like `writev_all()`, we call `os.readv()` repeatedly since it accepts at
+    most `IOV_MAX` buffers and might read fewer bytes than requested.
 
-def disk_write(path: str, frames: Iterable, shared_filesystem: bool, gds=False) -> dict:
+    Parameters
+    ----------
+    fd: int
+        File descriptor to read from
+    buffers: Sequence
+        The buffers to fill, must support the writable buffer protocol
+
+    Raises
+    ------
+    EOFError
+        If the file ends before all buffers are filled
+    """
+    bufs = list(buffers)
+    i = 0
+    while i < len(bufs):
+        batch = bufs[i : i + _IOV_MAX]
+        read = os.readv(fd, batch)
+        if read == 0 and sum(map(nbytes, batch)) > 0:
+            raise EOFError("End of file reached before all frames were read")
+        # Skip the fully read buffers and slice the partially read one
+        while i < len(bufs) and read >= nbytes(bufs[i]):
+            read -= nbytes(bufs[i])
+            i += 1
+        if read > 0:
+            bufs[i] = memoryview(bufs[i]).cast("B")[read:]
+
+
+def disk_write(path: str, frames: Sequence, shared_filesystem: bool, gds=False) -> dict:
     """Write frames to disk
 
     Parameters
     ----------
     path: str
         File path
-    frames: Iterable
+    frames: Sequence
         The frames to write to disk
     shared_filesystem: bool
         Whether the target filesystem is shared between all workers or not.
@@ -176,8 +242,11 @@ def disk_write(path: str, frames: Iterable, shared_filesystem: bool, gds=False)
             for each_fut in futures:
                 each_fut.get()
     else:
-        with open(path, "wb") as f:
-            os.writev(f.fileno(), frames)  # type: ignore
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            writev_all(fd, frames)
+        finally:
+            os.close(fd)
     return {
         "method": "stdio",
         "path": SpillToDiskFile(path),
@@ -219,6 +288,9 @@ def disk_read(header: Mapping, gds=False) -> list:
             for each_fut in futures:
                 each_fut.get()
     else:
-        with open(str(header["path"]), "rb") as f:
-            os.readv(f.fileno(), ret)  # type: ignore
+        fd = os.open(str(header["path"]), os.O_RDONLY)
+        try:
+            readv_all(fd, ret)
+        finally:
+            os.close(fd)
     return ret
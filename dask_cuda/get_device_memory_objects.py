@@ -1,4 +1,4 @@
-from typing import Set
+from typing import List
 
 from dask.sizeof import sizeof
 from dask.utils import Dispatch
@@ -6,30 +6,14 @@ from dask.utils import Dispatch
 dispatch = Dispatch(name="get_device_memory_objects")
 
 
-class DeviceMemoryId:
-    """ID and size of device memory objects
-
-    Instead of keeping a reference to device memory objects this class
-    only saves the id and size in order to avoid delayed freeing.
-    """
-
-    def __init__(self, obj: object):
-        self.id = id(obj)
-        self.nbytes = sizeof(obj)
-
-    def __hash__(self) -> int:
-        return self.id
-
-    def __eq__(self, o) -> bool:
-        return self.id == hash(o)
-
-
-def get_device_memory_ids(obj) -> Set[DeviceMemoryId]:
+def get_device_memory_objects(obj) -> List[object]:
     """Find all CUDA device objects in `obj`
 
     Search through `obj` and find all CUDA device objects, which are objects
     that either are known to `dispatch` or implement `__cuda_array_interface__`.
 
+    Notice, the returned list might contain the same object multiple times.
+
     Parameters
     ----------
     obj: Any
@@ -37,10 +21,10 @@ def get_device_memory_ids(obj) -> Set[DeviceMemoryId]:
 
     Returns
     -------
-    ret: Set[DeviceMemoryId]
-        Set of CUDA device memory IDs
+    ret: List[object]
+        List of CUDA device objects
     """
-    return {DeviceMemoryId(o) for o in dispatch(obj)}
+    return dispatch(obj)
 
 
 @dispatch.register(object)
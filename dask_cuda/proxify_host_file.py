@@ -1,5 +1,9 @@
 import abc
+import contextvars
+import copy
+import functools
 import gc
+import heapq
 import io
 import logging
 import os
@@ -10,17 +14,18 @@ import time
 import traceback
 import warnings
 import weakref
-from collections import defaultdict
 from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Callable,
-    DefaultDict,
     Dict,
     Hashable,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -28,9 +33,10 @@ from typing import (
 from weakref import ReferenceType
 
 import dask
+import distributed.utils
 from dask.sizeof import sizeof
 from dask.utils import format_bytes
-from distributed.protocol.compression import decompress, maybe_compress
+from distributed.protocol.compression import compressions, decompress, maybe_compress
 from distributed.protocol.serialize import (
     merge_and_deserialize,
     register_serialization_family,
@@ -39,7 +45,7 @@ from distributed.protocol.serialize import (
 
 from . import proxify_device_objects as pdo
 from .disk_io import SpillToDiskProperties, disk_read, disk_write
-from .get_device_memory_objects import DeviceMemoryId, get_device_memory_ids
+from .get_device_memory_objects import get_device_memory_objects
 from .is_spillable_object import cudf_spilling_status
 from .proxify_device_objects import proxify_device_objects, unproxify_device_objects
 from .proxy_object import ProxyObject
@@ -47,17 +53,97 @@ from .utils import get_rmm_device_memory_usage
 
 T = TypeVar("T")
 
+_compression_executor: Optional[ThreadPoolExecutor] = None
+_compression_executor_lock = threading.Lock()
+
+# Only frames within this range are compressed, the maximum is hardcoded in
+# `maybe_compress()` whereas the minimum is passed as its `min_size` argument
+_COMPRESSION_MIN_SIZE = 10_000
+_COMPRESSION_MAX_SIZE = 2**31
+
+
+def _get_compression_executor() -> Optional[ThreadPoolExecutor]:
+    """Get the thread pool used by `compress_frames()`
+
+    The number of threads is set by the "jit-unspill-compression-threads"
+    config value, which defaults to 4. The value is read when the pool is
+    created and a value less than 2 disables the pool.
+
+    Returns
+    -------
+    The thread pool or None if disabled
+    """
+    global _compression_executor
+    with _compression_executor_lock:
+        if _compression_executor is None:
+            nthreads = dask.config.get("jit-unspill-compression-threads", default=4)
+            if nthreads < 2:
+                return None
+            _compression_executor = ThreadPoolExecutor(
+                max_workers=nthreads, thread_name_prefix="dask-cuda-compress"
+            )
+        return _compression_executor
+
+
+def compress_frames(frames: Sequence) -> Tuple[Tuple[Optional[str], ...], tuple]:
+    """Compress frames using `maybe_compress()`
+
+    The compression libraries release the GIL thus when multiple frames are
+    large enough to be compressed, they are compressed in parallel using a
+    thread pool shared by all calls. Each task runs in a copy of the caller's
+    context, which makes sure that metrics reported through `context_meter`
+    reach the caller.
+
+    Parameters
+    ----------
+    frames: Sequence
+        The frames to compress, must be non-empty
+
+    Returns
+    -------
+    compression: tuple
+        The compression used for each frame, None if not compressed
+    frames: tuple
+        The (possibly) compressed frames
+    """
+    compress = functools.partial(maybe_compress, min_size=_COMPRESSION_MIN_SIZE)
+    executor = None
+    if compressions["auto"].name is not None:
+        large_frames = 0
+        for f in frames:
+            nbytes = distributed.utils.nbytes(f)
+            if _COMPRESSION_MIN_SIZE <= nbytes <= _COMPRESSION_MAX_SIZE:
+                large_frames += 1
+        if large_frames > 1:
+            executor = _get_compression_executor()
+    if executor is None:
+        results: Iterable = map(compress, frames)
+    else:
+        futures = [
+            executor.submit(contextvars.copy_context().run, compress, f) for f in frames
+        ]
+        results = [f.result() for f in futures]
+    compression, compressed_frames = zip(*results)
+    return compression, compressed_frames
+
 
 class Proxies(abc.ABC):
     """Abstract base class to implement tracking of proxies
 
-    This class is not threadsafe
+    This class is not threadsafe. All access goes through `ProxyManager`,
+    which must hold `ProxyManager.lock` while doing so.
+
+    Proxies are tracked using explicit weak references, which only `add()` and
+    `remove()` modify. Notice, the garbage collector might clear the weak
+    reference of a proxy in a reference cycle before `ProxyObject.__del__()`
+    removes the proxy, in which case the dead proxy stays tracked until then.
     """
 
+    __slots__ = ("_proxy_id_to_proxy", "_mem_usage")
+
     def __init__(self):
         self._proxy_id_to_proxy: Dict[int, ReferenceType[ProxyObject]] = {}
         self._mem_usage = 0
-        self._lock = threading.Lock()
 
     def __len__(self) -> int:
         return len(self._proxy_id_to_proxy)
@@ -76,19 +162,35 @@ class Proxies(abc.ABC):
 
         The returned format is:
             `[(<access-time>, <size-of-buffer>, <list-of-proxies>), ...]
+
+        This is used by `ProxyManager.evict()` to find spill candidates.
+        Proxies that are no longer alive are skipped.
+        """
+
+    @abc.abstractmethod
+    def validate(self) -> None:
+        """Validate the memory tally, used by `ProxyManager.validate()`
+
+        Notice, in order to keep `add()` cheap, it doesn't check whether the
+        proxy is already tracked. Instead, this checks that the memory tally
+        matches the tracked proxies.
         """
 
     def add(self, proxy: ProxyObject) -> None:
         """Add a proxy for tracking, calls `self.mem_usage_add`"""
-        assert not self.contains_proxy_id(id(proxy))
-        with self._lock:
-            self._proxy_id_to_proxy[id(proxy)] = weakref.ref(proxy)
+        self._proxy_id_to_proxy[id(proxy)] = weakref.ref(proxy)
         self.mem_usage_add(proxy)
 
+    def add_many(self, proxies: Iterable[ProxyObject]) -> None:
+        """Add multiple proxies for tracking, calls `self.mem_usage_add`"""
+        proxy_id_to_proxy = self._proxy_id_to_proxy
+        for proxy in proxies:
+            proxy_id_to_proxy[id(proxy)] = weakref.ref(proxy)
+            self.mem_usage_add(proxy)
+
     def remove(self, proxy: ProxyObject) -> None:
         """Remove proxy from tracking, calls `self.mem_usage_remove`"""
-        with self._lock:
-            del self._proxy_id_to_proxy[id(proxy)]
+        del self._proxy_id_to_proxy[id(proxy)]
         self.mem_usage_remove(proxy)
         if len(self._proxy_id_to_proxy) == 0:
             if self._mem_usage != 0:
@@ -99,29 +201,16 @@ class Proxies(abc.ABC):
                 )
                 self._mem_usage = 0
 
+    def iter_proxies(self) -> Iterator[ProxyObject]:
+        """Iterate over all proxies without materializing a list"""
+        for p in self._proxy_id_to_proxy.values():
+            proxy = p()
+            if proxy is not None:
+                yield proxy
+
     def get_proxies(self) -> List[ProxyObject]:
         """Return a list of all proxies"""
-        with self._lock:
-            ret = []
-            for p in self._proxy_id_to_proxy.values():
-                proxy = p()
-                if proxy is not None:
-                    ret.append(proxy)
-            return ret
-
-    def get_proxies_by_ids(self, proxy_ids: Iterable[int]) -> List[ProxyObject]:
-        """Return a list of proxies"""
-        ret = []
-        for proxy_id in proxy_ids:
-            weakref_proxy = self._proxy_id_to_proxy.get(proxy_id)
-            if weakref_proxy is not None:
-                proxy = weakref_proxy()
-                if proxy is not None:
-                    ret.append(proxy)
-        return ret
-
-    def contains_proxy_id(self, proxy_id: int) -> bool:
-        return proxy_id in self._proxy_id_to_proxy
+        return list(self.iter_proxies())
 
     def mem_usage(self) -> int:
         return self._mem_usage
@@ -130,26 +219,35 @@ class Proxies(abc.ABC):
 class ProxiesOnHost(Proxies):
     """Implement tracking of proxies on the CPU
 
-    This uses dask.sizeof to update memory usage.
+    This uses `ProxyObject.__sizeof__()` to update memory usage. The proxy
+    caches its size thus we subtract the same size when the proxy is removed.
     """
 
+    __slots__ = ()
+
     def mem_usage_add(self, proxy: ProxyObject) -> None:
-        self._mem_usage += sizeof(proxy)
+        self._mem_usage += proxy.__sizeof__()
 
     def mem_usage_remove(self, proxy: ProxyObject) -> None:
-        self._mem_usage -= sizeof(proxy)
+        self._mem_usage -= proxy.__sizeof__()
 
     def buffer_info(self) -> List[Tuple[float, int, List[ProxyObject]]]:
         ret = []
-        for p in self.get_proxies():
-            size = sizeof(p)
-            ret.append((p._pxy_get().last_access, size, [p]))
+        for p in self._proxy_id_to_proxy.values():
+            proxy = p()
+            if proxy is not None:
+                ret.append((proxy._pxy_get().last_access, proxy.__sizeof__(), [proxy]))
         return ret
 
+    def validate(self) -> None:
+        assert sum(p.__sizeof__() for p in self.iter_proxies()) == self._mem_usage
+
 
 class ProxiesOnDisk(ProxiesOnHost):
     """Implement tracking of proxies on the Disk"""
 
+    __slots__ = ()
+
 
 class ProxiesOnDevice(Proxies):
     """Implement tracking of proxies on the GPU
@@ -162,42 +260,69 @@ class ProxiesOnDevice(Proxies):
     Notice, we only track direct aliasing thus multiple proxy objects can
     point to different non-overlapping parts of the same device buffer.
     In this case the tally of the total device memory usage is incorrect.
+
+    Device memory objects are identified by their `id()` and their size is
+    only queried once, when first tracked, and cached in `dev_mem_to_size`.
     """
 
+    __slots__ = ("proxy_id_to_dev_mems", "dev_mem_to_proxy_ids", "dev_mem_to_size")
+
     def __init__(self) -> None:
         super().__init__()
-        self.proxy_id_to_dev_mems: Dict[int, Set[DeviceMemoryId]] = {}
-        self.dev_mem_to_proxy_ids: DefaultDict[DeviceMemoryId, Set[int]] = defaultdict(
-            set
-        )
+        self.proxy_id_to_dev_mems: Dict[int, Set[int]] = {}
+        self.dev_mem_to_proxy_ids: Dict[int, Set[int]] = {}
+        self.dev_mem_to_size: Dict[int, int] = {}
 
     def mem_usage_add(self, proxy: ProxyObject) -> None:
         proxy_id = id(proxy)
-        assert proxy_id not in self.proxy_id_to_dev_mems
-        self.proxy_id_to_dev_mems[proxy_id] = set()
-        for dev_mem in get_device_memory_ids(proxy._pxy_get().obj):
-            self.proxy_id_to_dev_mems[proxy_id].add(dev_mem)
-            ps = self.dev_mem_to_proxy_ids[dev_mem]
-            if len(ps) == 0:
-                self._mem_usage += dev_mem.nbytes
+        dev_mems = self.proxy_id_to_dev_mems[proxy_id] = set()
+        for dev_buf in get_device_memory_objects(proxy._pxy_get().obj):
+            dev_mem = id(dev_buf)
+            dev_mems.add(dev_mem)
+            ps = self.dev_mem_to_proxy_ids.get(dev_mem)
+            if ps is None:
+                ps = self.dev_mem_to_proxy_ids[dev_mem] = set()
+                size = self.dev_mem_to_size[dev_mem] = sizeof(dev_buf)
+                self._mem_usage += size
             ps.add(proxy_id)
 
     def mem_usage_remove(self, proxy: ProxyObject) -> None:
         proxy_id = id(proxy)
         for dev_mem in self.proxy_id_to_dev_mems.pop(proxy_id):
-            self.dev_mem_to_proxy_ids[dev_mem].remove(proxy_id)
-            if len(self.dev_mem_to_proxy_ids[dev_mem]) == 0:
+            ps = self.dev_mem_to_proxy_ids[dev_mem]
+            ps.remove(proxy_id)
+            if len(ps) == 0:
                 del self.dev_mem_to_proxy_ids[dev_mem]
-                self._mem_usage -= dev_mem.nbytes
+                self._mem_usage -= self.dev_mem_to_size.pop(dev_mem)
 
     def buffer_info(self) -> List[Tuple[float, int, List[ProxyObject]]]:
+        # A proxy typically refers to multiple device buffers thus we look up
+        # the proxies and their access time once, not once per buffer.
+        proxies = {}
+        for proxy_id, p in self._proxy_id_to_proxy.items():
+            proxy = p()
+            if proxy is not None:
+                proxies[proxy_id] = proxy
+        access = {i: p._pxy_get().last_access for i, p in proxies.items()}
         ret = []
         for dev_mem, proxy_ids in self.dev_mem_to_proxy_ids.items():
-            proxies = self.get_proxies_by_ids(proxy_ids)
-            last_access = max(p._pxy_get().last_access for p in proxies)
-            ret.append((last_access, dev_mem.nbytes, proxies))
+            ids = [i for i in proxy_ids if i in access]
+            if len(ids) == 0:
+                continue
+            last_access = max(access[i] for i in ids)
+            size = self.dev_mem_to_size[dev_mem]
+            ret.append((last_access, size, [proxies[i] for i in ids]))
         return ret
 
+    def validate(self) -> None:
+        assert self.proxy_id_to_dev_mems.keys() == self._proxy_id_to_proxy.keys()
+        assert self.dev_mem_to_proxy_ids.keys() == self.dev_mem_to_size.keys()
+        for dev_mem, ids in self.dev_mem_to_proxy_ids.items():
+            assert len(ids) > 0
+            for i in ids:
+                assert dev_mem in self.proxy_id_to_dev_mems[i]
+        assert sum(self.dev_mem_to_size.values()) == self._mem_usage
+
 
 class ProxyManager:
     """
@@ -212,11 +337,30 @@ class ProxyManager:
     Notice, the manager only keeps weak references to the proxies.
     """
 
+    __slots__ = (
+        "lock",
+        "_disk",
+        "_host",
+        "_dev",
+        "_location",
+        "_by_serializer",
+        "_device_memory_limit",
+        "_host_memory_limit",
+    )
+
     def __init__(self, device_memory_limit: int, memory_limit: int):
         self.lock = threading.RLock()
         self._disk = ProxiesOnDisk()
         self._host = ProxiesOnHost()
         self._dev = ProxiesOnDevice()
+        # Mapping of proxy IDs to the Proxies collection they are located in
+        self._location: Dict[int, Proxies] = {}
+        # Mapping of serializers to Proxies collections, anything else is on device
+        self._by_serializer: Dict[Optional[str], Proxies] = {
+            "disk": self._disk,
+            "dask": self._host,
+            "pickle": self._host,
+        }
         self._device_memory_limit = device_memory_limit
         self._host_memory_limit = memory_limit
 
@@ -239,85 +383,67 @@ class ProxyManager:
             if len(self) == 0:
                 return ret + " Empty"
             ret += "\n"
-            for proxy in self._disk.get_proxies():
+            for proxy in self._disk.iter_proxies():
                 ret += f"  disk - {repr(proxy)}\n"
-            for proxy in self._host.get_proxies():
+            for proxy in self._host.iter_proxies():
                 ret += f"  host - {repr(proxy)}\n"
-            for proxy in self._dev.get_proxies():
+            for proxy in self._dev.iter_proxies():
                 ret += f"  dev  - {repr(proxy)}\n"
             return ret[:-1]  # Strip last newline
 
     def get_proxies_by_serializer(self, serializer: Optional[str]) -> Proxies:
         """Get Proxies collection by serializer"""
-        if serializer == "disk":
-            return self._disk
-        elif serializer in ("dask", "pickle"):
-            return self._host
-        else:
-            return self._dev
-
-    def get_proxies_by_proxy_object(self, proxy: ProxyObject) -> Optional[Proxies]:
-        """Get Proxies collection by proxy object"""
-        proxy_id = id(proxy)
-        if self._dev.contains_proxy_id(proxy_id):
-            return self._dev
-        if self._host.contains_proxy_id(proxy_id):
-            return self._host
-        if self._disk.contains_proxy_id(proxy_id):
-            return self._disk
-        return None
-
-    def contains(self, proxy_id: int) -> bool:
-        """Is the proxy in any of the Proxies collection?"""
-        with self.lock:
-            return (
-                self._disk.contains_proxy_id(proxy_id)
-                or self._host.contains_proxy_id(proxy_id)
-                or self._dev.contains_proxy_id(proxy_id)
-            )
+        return self._by_serializer.get(serializer, self._dev)
 
     def add(self, proxy: ProxyObject, serializer: Optional[str]) -> None:
         """Add the proxy to the Proxies collection by that match the serializer"""
+        proxy_id = id(proxy)
         with self.lock:
-            old_proxies = self.get_proxies_by_proxy_object(proxy)
+            location = self._location
+            old_proxies = location.get(proxy_id)
             new_proxies = self.get_proxies_by_serializer(serializer)
             if old_proxies is not new_proxies:
                 if old_proxies is not None:
                     old_proxies.remove(proxy)
                 new_proxies.add(proxy)
+                location[proxy_id] = new_proxies
+
+    def add_many(self, proxies: Iterable[ProxyObject]) -> None:
+        """Add new proxies to the Proxies collections that match their serializers
+
+        Notice, unlike `add()`, the proxies must not already be tracked.
+        """
+        with self.lock:
+            location = self._location
+            new_proxies: Dict[Proxies, List[ProxyObject]] = {}
+            for proxy in proxies:
+                target = self.get_proxies_by_serializer(proxy._pxy_get().serializer)
+                new_proxies.setdefault(target, []).append(proxy)
+                location[id(proxy)] = target
+            for target, ps in new_proxies.items():
+                target.add_many(ps)
 
     def remove(self, proxy: ProxyObject) -> None:
         """Remove the proxy from the Proxies collection it is in"""
         with self.lock:
-            # Find where the proxy is located (if found) and remove it
-            proxies: Optional[Proxies] = None
-            if self._disk.contains_proxy_id(id(proxy)):
-                proxies = self._disk
-            if self._host.contains_proxy_id(id(proxy)):
-                assert proxies is None, "Proxy in multiple locations"
-                proxies = self._host
-            if self._dev.contains_proxy_id(id(proxy)):
-                assert proxies is None, "Proxy in multiple locations"
-                proxies = self._dev
+            proxies = self._location.pop(id(proxy), None)
             assert proxies is not None, "Trying to remove unknown proxy"
             proxies.remove(proxy)
 
     def validate(self):
         """Validate the state of the manager"""
         with self.lock:
+            assert len(self._location) == len(self)
             for serializer in ("disk", "dask", "cuda"):
                 proxies = self.get_proxies_by_serializer(serializer)
-                for p in proxies.get_proxies():
-                    assert (
-                        self.get_proxies_by_serializer(p._pxy_get().serializer)
-                        is proxies
-                    )
-                with proxies._lock:
-                    for i, p in proxies._proxy_id_to_proxy.items():
-                        assert p() is not None
-                        assert i == id(p())
-                for p in proxies.get_proxies():
-                    pxy = p._pxy_get()
+                proxies.validate()
+                for i, p in proxies._proxy_id_to_proxy.items():
+                    proxy = p()
+                    assert proxy is not None
+                    assert i == id(proxy)
+                    assert self._location[i] is proxies
+                    pxy = proxy._pxy_get()
+                    assert self.get_proxies_by_serializer(pxy.serializer) is proxies
                     if pxy.is_serialized():
                         header, _ = pxy.obj
                         assert header["serializer"] == pxy.serializer
@@ -351,26 +477,35 @@ class ProxyManager:
         """
 
         incompatible_type_found = False
-        with self.lock:
-            found_proxies: List[ProxyObject] = []
-            if duplicate_check:
-                # In order to detect already proxied object, proxify_device_objects()
-                # needs a mapping from proxied objects to their proxy objects.
+        found_proxies: List[ProxyObject] = []
+        if duplicate_check:
+            # In order to detect already proxied object, proxify_device_objects()
+            # needs a mapping from proxied objects to their proxy objects.
+            with self.lock:
                 proxied_id_to_proxy = {
-                    id(p._pxy_get().obj): p for p in self._dev.get_proxies()
+                    id(p._pxy_get().obj): p for p in self._dev.iter_proxies()
                 }
-            else:
-                proxied_id_to_proxy = None
-            ret = proxify_device_objects(obj, proxied_id_to_proxy, found_proxies)
+        else:
+            proxied_id_to_proxy = None
+
+        # Searching through `obj` can be expensive thus we do it without holding
+        # the lock, only the bookkeeping of the found proxies requires the lock.
+        ret = proxify_device_objects(obj, proxied_id_to_proxy, found_proxies)
+        with self.lock:
             last_access = time.monotonic()
+            location = self._location
+            # Notice, `found_proxies` might contain the same proxy multiple times
+            new_proxies: Dict[int, ProxyObject] = {}
             for p in found_proxies:
                 pxy = p._pxy_get()
                 pxy.last_access = last_access
-                if not self.contains(id(p)):
+                proxy_id = id(p)
+                if proxy_id not in location:
                     pxy.manager = self
-                    self.add(proxy=p, serializer=pxy.serializer)
+                    new_proxies[proxy_id] = p
                 if pdo.incompatible_types and isinstance(p, pdo.incompatible_types):
                     incompatible_type_found = True
+            self.add_many(new_proxies.values())
         self.maybe_evict()
         return ret, incompatible_type_found
 
@@ -405,8 +540,14 @@ class ProxyManager:
         proxies_to_serialize: List[ProxyObject] = []
         with self.lock:
             access = proxies_access()
-            access.sort(key=lambda x: (x[0], -x[1]))
-            for _, size, proxies in access:
+            # Typically, we only need a few buffers to free up `nbytes` thus
+            # instead of sorting all of them, we use a heap ordered by access
+            # time and size (largest first). The index breaks ties.
+            heap = [(t, -size, i) for i, (t, size, _) in enumerate(access)]
+            heapq.heapify(heap)
+            while heap:
+                _, _, i = heapq.heappop(heap)
+                _, size, proxies = access[i]
                 proxies_to_serialize.extend(proxies)
                 freed_memory += size
                 if freed_memory >= nbytes:
@@ -415,8 +556,9 @@ class ProxyManager:
         serialized_proxies: Set[int] = set()
         for p in proxies_to_serialize:
             # Avoid trying to serialize the same proxy multiple times
-            if id(p) not in serialized_proxies:
-                serialized_proxies.add(id(p))
+            proxy_id = id(p)
+            if proxy_id not in serialized_proxies:
+                serialized_proxies.add(proxy_id)
                 serializer(p)
         return freed_memory
 
@@ -425,9 +567,13 @@ class ProxyManager:
 
         Adds `extra_dev_mem` to the current total memory usage when comparing
         against device-memory-limit.
+
+        Notice, the common case where no eviction is needed doesn't take the lock.
+        Reading the tally without the lock is fine since it is a single integer and
+        `evict()` retrieves the buffers to spill while holding the lock.
         """
         mem_over_usage = (
-            self._dev.mem_usage() + extra_dev_mem - self._device_memory_limit
+            self._dev._mem_usage + extra_dev_mem - self._device_memory_limit
         )
         if mem_over_usage > 0:
             self.evict(
@@ -444,7 +590,7 @@ class ProxyManager:
         """
         assert self._host_memory_limit is not None
         mem_over_usage = (
-            self._host.mem_usage() + extra_host_mem - self._host_memory_limit
+            self._host._mem_usage + extra_host_mem - self._host_memory_limit
         )
         if mem_over_usage > 0:
             self.evict(
@@ -726,7 +872,7 @@ class ProxifyHostFile(MutableMapping):
                 x, serializers=serializers, on_error="raise"
             )
             if frames:
-                compression, frames = zip(*map(maybe_compress, frames))
+                compression, frames = compress_frames(frames)
             else:
                 compression = []
             serialize_header["compression"] = compression
@@ -764,29 +910,37 @@ class ProxifyHostFile(MutableMapping):
         "pickle". In this case the already serialized data is written
         directly to disk.
 
+        If `proxy` is already serialized to disk, nothing is written. Notice,
+        when such a proxy is later communicated on a shared filesystem, the
+        existing file is hard-linked by `handle_disk_serialized()` instead of
+        being re-written.
+
         Parameters
         ----------
         proxy : ProxyObject
             Proxy object to serialize using the "disk" serialize.
         """
         assert cls._spill_to_disk is not None
-        pxy = proxy._pxy_get(copy=True)
-        if pxy.is_serialized():
+        pxy = proxy._pxy_get()
+        if pxy.serializer == "disk":
+            return  # Nothing to be done
+        if pxy.serializer in ("dask", "pickle"):
+            # Only copy the proxy detail when we are about to modify it
+            pxy = copy.copy(pxy)
             header, frames = pxy.obj
-            if header["serializer"] in ("dask", "pickle"):
-                pxy.obj = (
-                    {
-                        "serializer": "disk",
-                        "disk-io-header": disk_write(
-                            path=cls._spill_to_disk.gen_file_path(),
-                            frames=frames,
-                            shared_filesystem=cls._spill_to_disk.shared_filesystem,
-                        ),
-                        "serialize-header": header,
-                    },
-                    [],
-                )
-                pxy.serializer = "disk"
-                proxy._pxy_set(pxy)
-                return
-        proxy._pxy_serialize(serializers=("disk",), proxy_detail=pxy)
+            pxy.obj = (
+                {
+                    "serializer": "disk",
+                    "disk-io-header": disk_write(
+                        path=cls._spill_to_disk.gen_file_path(),
+                        frames=frames,
+                        shared_filesystem=cls._spill_to_disk.shared_filesystem,
+                    ),
+                    "serialize-header": header,
+                },
+                [],
+            )
+            pxy.serializer = "disk"
+            proxy._pxy_set(pxy)
+            return
+        proxy._pxy_serialize(serializers=("disk",))
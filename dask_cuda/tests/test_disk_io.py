@@ -0,0 +1,51 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from dask_cuda import disk_io
+from dask_cuda.disk_io import disk_read, disk_write
+
+
+@pytest.mark.parametrize("max_io", [None, 1, 7])
+@pytest.mark.parametrize("iov_max", [1, 3, 1024])
+def test_disk_write_read(tmp_path, max_io, iov_max):
+    frames = [b"", b"abcdef", memoryview(b"0123456789"), np.arange(5), b"", b"xy"]
+    writev, readv = os.writev, os.readv
+
+    def partial_writev(fd, buffers):
+        """Emulate an `os.writev()` that writes at most `max_io` bytes"""
+        if max_io is None:
+            return writev(fd, buffers)
+        data = b"".join(bytes(memoryview(b).cast("B")) for b in buffers)
+        return os.write(fd, data[:max_io])
+
+    def partial_readv(fd, buffers):
+        """Emulate an `os.readv()` that reads at most `max_io` bytes"""
+        if max_io is None:
+            return readv(fd, buffers)
+        ret = 0
+        for b in buffers:
+            b = memoryview(b).cast("B")
+            n = readv(fd, [b[: max_io - ret]])
+            ret += n
+            if ret == max_io or n < len(b):
+                break
+        return ret
+
+    path = str(tmp_path / "frames")
+    with patch.object(disk_io, "_IOV_MAX", iov_max):
+        with patch.object(disk_io.os, "writev", side_effect=partial_writev):
+            header = disk_write(path, frames, shared_filesystem=False)
+        with patch.object(disk_io.os, "readv", side_effect=partial_readv):
+            res = disk_read(header)
+    assert [bytes(f) for f in res] == [bytes(memoryview(f).cast("B")) for f in frames]
+
+
+def test_disk_read_truncated_file(tmp_path):
+    path = str(tmp_path / "frames")
+    header = disk_write(path, [b"abc", b"def"], shared_filesystem=False)
+    os.truncate(path, 4)
+    with pytest.raises(EOFError):
+        disk_read(header)
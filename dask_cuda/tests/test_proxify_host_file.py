@@ -15,7 +15,7 @@ from distributed.utils_test import gen_test
 
 import dask_cuda
 import dask_cuda.proxify_device_objects
-from dask_cuda.get_device_memory_objects import get_device_memory_ids
+from dask_cuda.get_device_memory_objects import get_device_memory_objects
 from dask_cuda.proxify_host_file import ProxifyHostFile
 from dask_cuda.proxy_object import ProxyObject, asproxy, unproxy
 from dask_cuda.utils import get_device_total_memory
@@ -310,7 +310,7 @@ def test_cudf_get_device_memory_objects():
             levels=[[1, 2], ["blue", "red"]], codes=[[0, 0, 1, 1], [1, 0, 1, 0]]
         ),
     ]
-    res = get_device_memory_ids(objects)
+    res = {id(o) for o in get_device_memory_objects(objects)}
     # Buffers are:
     # 1. int data for objects[0].a
     # 2. mask data for objects[0].a
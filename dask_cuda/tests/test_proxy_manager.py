@@ -0,0 +1,94 @@
+import gc
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import dask
+from distributed.metrics import context_meter
+from distributed.protocol.compression import maybe_compress
+
+from dask_cuda import proxify_host_file
+from dask_cuda.proxify_host_file import ProxyManager, compress_frames
+from dask_cuda.proxy_object import asproxy
+
+
+def test_proxify_registers_found_proxies():
+    manager = ProxyManager(device_memory_limit=10**9, memory_limit=10**9)
+    p1 = asproxy(np.arange(10), serializers=("dask", "pickle"))
+    p2 = asproxy(np.arange(20), serializers=("pickle",))
+    p3 = asproxy(np.arange(30))
+    assert p1._pxy_get().serializer == "dask"
+    assert p2._pxy_get().serializer == "pickle"
+    assert p3._pxy_get().serializer is None
+
+    # `p1` appears multiple times but must only be registered once
+    ret, _ = manager.proxify([p1, p2, (p1, p3), {"p1": p1}], duplicate_check=False)
+    manager.validate()
+    assert ret[0] is p1 and ret[2][0] is p1
+    assert len(manager) == 3
+    assert sorted(map(id, manager._host.get_proxies())) == sorted([id(p1), id(p2)])
+    assert [id(p) for p in manager._dev.get_proxies()] == [id(p3)]
+    assert manager._host.mem_usage() == p1.__sizeof__() + p2.__sizeof__()
+
+    # Proxifying already registered proxies doesn't register them again
+    manager.proxify([p1, p2, p3])
+    manager.validate()
+    assert len(manager) == 3
+
+    del ret, p1, p2, p3
+    manager.validate()
+    assert len(manager) == 0
+    assert manager._host.mem_usage() == 0
+
+
+def test_proxies_in_reference_cycle():
+    manager = ProxyManager(device_memory_limit=10**9, memory_limit=10**9)
+    proxies = [
+        asproxy(np.arange(1000), serializers=("dask", "pickle")) for _ in range(2)
+    ]
+    manager.proxify(proxies)
+    manager.validate()
+    assert len(manager._host) == 2
+
+    # The garbage collector clears the weak references of the proxies before
+    # calling their `__del__()`, which must not confuse the tally
+    proxies.append(proxies)
+    del proxies
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        gc.collect()
+    assert not [w for w in record if "ProxyManager" in str(w.message)]
+    manager.validate()
+    assert len(manager) == 0
+    assert manager._host.mem_usage() == 0
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_compress_frames(nthreads):
+    rng = np.random.default_rng(42)
+    frames = [
+        b"small",
+        np.zeros(10_000),  # Compressible
+        rng.integers(0, 255, size=20_000, dtype="u1"),  # Incompressible
+        memoryview(b"x" * 50_000),
+    ]
+    expect = [maybe_compress(f) for f in frames]
+
+    metrics = []
+    with dask.config.set({"jit-unspill-compression-threads": nthreads}):
+        with patch.object(proxify_host_file, "_compression_executor", None):
+            try:
+                with context_meter.add_callback(
+                    lambda label, value, unit: metrics.append(label)
+                ):
+                    compression, res = compress_frames(frames)
+            finally:
+                executor = proxify_host_file._compression_executor
+                if executor is not None:
+                    executor.shutdown()
+    assert (executor is not None) == (nthreads > 1)
+    assert list(compression) == [c for c, _ in expect]
+    assert [bytes(f) for f in res] == [bytes(f) for _, f in expect]
+    assert metrics.count("compress") == len(frames)